@@ -0,0 +1,239 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.core.metrics import metrics_asgi
+from app.core.middleware import LoggingMiddleware, PrometheusMiddleware
+from app.schemas.health import HealthCheck
+
+logger = setup_logging().bind(component="core.app")
+
+_STATUS_BODY = b'{"status":"Application is running"}'
+_STATUS_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_STATUS_BODY)).encode()),
+)
+
+
+class _StatusEndpoint:
+    """Constant /status response: pre-encoded bytes, precomputed headers.
+
+    The start message and its headers list are built fresh per request:
+    middleware (CORS, the x-response-time stamp) mutates ``message["headers"]``
+    in place, so a shared message would leak one request's headers into every
+    later response. Only the immutable pieces are module constants.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": list(_STATUS_HEADERS),
+            }
+        )
+        await send({"type": "http.response.body", "body": _STATUS_BODY})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Single startup/shutdown context replacing the deprecated on_event hooks."""
+    logger.info("application startup", version=settings.version)
+    # The health payload depends only on settings, so it is rendered exactly
+    # once here instead of rebuilding the model on every load-balancer poll.
+    components = {"api": "ok"}
+    status = "ok" if all(v == "ok" for v in components.values()) else "degraded"
+    app.state.health_body = (
+        HealthCheck(status=status, components=components, version=settings.version)
+        .model_dump_json()
+        .encode()
+    )
+    from app.core.proxy import create_async_client
+
+    app.state.client = create_async_client()
+    refresher_task = None
+    if settings.proxy_auth_token_url:
+        from app.core.auth import token_cache
+
+        refresher_task = asyncio.create_task(token_cache.run_refresher(app.state.client))
+    if settings.llm_hub_enabled:
+        from app.services.llm_hub import LlmHub
+
+        llm_hub = LlmHub()
+        llm_hub.load_providers()
+        app.state.llm_hub = llm_hub
+        # Providers only change when they are (re)loaded, so the merged model
+        # listing is encoded once here and served as raw bytes.
+        app.state.models_payload = orjson.dumps(llm_hub.get_merged_models())
+    yield
+    if refresher_task is not None:
+        refresher_task.cancel()
+    await app.state.client.aclose()
+    logger.info("application shutdown")
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.version,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    app.router.routes.insert(0, Route("/metrics", metrics_asgi))
+    app.router.routes.insert(1, Route("/status", _StatusEndpoint()))
+
+    if settings.allowed_origins:
+        from fastapi.middleware.cors import CORSMiddleware
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"] if settings.cors_wildcard else list(settings.allowed_origins),
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    app.add_middleware(PrometheusMiddleware)
+    app.add_middleware(LoggingMiddleware)
+    if settings.gzip_enabled:
+        # Registered last so it sits outermost: logging/metrics still see the
+        # uncompressed body sizes while the client gets compressed bytes.
+        from starlette.middleware.gzip import GZipMiddleware
+
+        app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    @app.get("/health", response_model=HealthCheck)
+    async def health_check():
+        return Response(content=app.state.health_body, media_type="application/json")
+
+    if settings.llm_hub_enabled:
+        from app.core.auth import get_authorization_headers
+        from app.core.proxy import (
+            get_model_version,
+            proxy_request_to_provider,
+            proxy_request_with_retries,
+            sniff_model,
+            stream_multipart_post,
+        )
+
+        @app.get("/llm/v1/models")
+        async def get_models(request: Request):
+            return Response(
+                content=request.app.state.models_payload,
+                media_type="application/json",
+            )
+
+        @app.get("/llm/version")
+        async def llm_version(request: Request):
+            auth_headers = await get_authorization_headers(request.app.state.client)
+            return await get_model_version(request.app.state.client, auth_headers)
+
+        async def proxy_request(request: Request):
+            # Registered as a plain Starlette route below: the hottest path in
+            # the app skips FastAPI's Dependant graph walking entirely.
+            full_path = request.path_params["full_path"]
+            llm_hub = request.app.state.llm_hub
+            auth_headers = await get_authorization_headers(request.app.state.client)
+            if request.method == "POST":
+                content_type = request.headers.get("content-type", "")
+                if content_type.startswith("multipart/"):
+                    # File uploads (audio transcription, fine-tune files):
+                    # nothing to sniff in a multipart body, and buffering it
+                    # would hold the whole upload in memory — stream it up.
+                    return await stream_multipart_post(
+                        request, full_path, custom_headers=auth_headers
+                    )
+            if request.method == "POST" and llm_hub.providers:
+                # Read only as much of the body as needed to find the model,
+                # then forward the rest of the stream untouched.
+                prefix, remainder, model = await sniff_model(request)
+                resolved = llm_hub.resolve_model(model) if model else None
+                if resolved is not None:
+                    provider, stripped = resolved
+                    return await proxy_request_to_provider(
+                        request, provider, full_path, prefix, remainder, model, stripped
+                    )
+                body = prefix
+                if remainder is not None:
+                    async for chunk in remainder:
+                        body += chunk
+                return await proxy_request_with_retries(
+                    request, full_path, body=body, custom_headers=auth_headers
+                )
+            return await proxy_request_with_retries(
+                request, full_path, custom_headers=auth_headers
+            )
+
+        # One routing-table entry covering every verb the proxy forwards,
+        # instead of one entry per method. (methods=None would quietly mean
+        # GET/HEAD only.)
+        app.router.routes.append(
+            Route(
+                "/llm/{full_path:path}",
+                proxy_request,
+                methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
+            )
+        )
+
+    if settings.chain_hub_enabled:
+        from app.schemas.prompt import ChainMetadataForTracking, ChainType
+        from app.services.chain_store import chain_store
+
+        # Enum attribute access costs a lookup per request; resolve once.
+        _CT_CHAIN = ChainType.chain
+        _CT_PROMPT = ChainType.prompt
+
+        @app.get("/chains")
+        async def get_chains(category: str | None = None):
+            # get_chains returns pre-rendered JSON bytes; serve them as-is.
+            return Response(
+                content=chain_store.get_chains(category),
+                media_type="application/json",
+            )
+
+        @app.post("/chains/{chain_name}/execute")
+        async def chain_execute(chain_name: str, request: Request):
+            # A bad chain name is ordinary client input, not a server fault:
+            # reject it here as a 404 instead of letting the store's KeyError
+            # surface as a 500.
+            if chain_name not in chain_store.stored_chains:
+                raise HTTPException(
+                    status_code=404, detail=f"Unknown chain: {chain_name}"
+                )
+            payload = await request.json()
+            # The fields are trusted values from this process, so skip
+            # validation with model_construct.
+            metadata = ChainMetadataForTracking.model_construct(
+                chain_type=_CT_CHAIN,
+                chain_name=chain_name,
+                group_id=request.headers.get("x-group-id") or "unknown",
+            )
+            return await chain_store.execute(
+                chain_name,
+                payload.get("inputs", {}),
+                metadata=metadata.model_dump(),
+                model=payload.get("model"),
+                base_url=payload.get("base_url"),
+            )
+
+        @app.post("/prompts/execute")
+        async def execute_prompt(request: Request):
+            payload = await request.json()
+            metadata = ChainMetadataForTracking.model_construct(
+                chain_type=_CT_PROMPT,
+                chain_name="ad-hoc",
+                group_id=request.headers.get("x-group-id") or "unknown",
+            )
+            return await chain_store.execute_prompt(
+                payload["template"],
+                payload.get("inputs", {}),
+                metadata=metadata.model_dump(),
+            )
+
+    return app
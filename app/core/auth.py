@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import httpx
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+#: Refresh this many seconds before the token actually expires.
+_REFRESH_MARGIN = 30.0
+
+
+class TokenCache:
+    """Caches the upstream bearer token for its lifetime.
+
+    The fast path is a monotonic-clock comparison plus a dict build; the
+    token endpoint is only hit when the cached token is about to expire,
+    under a lock so concurrent expiries trigger a single refresh.
+    """
+
+    def __init__(self):
+        self.token: str | None = None
+        self.expires_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_headers(self, client: httpx.AsyncClient) -> dict:
+        if not settings.proxy_auth_token_url:
+            return {}
+        if self.token is None or time.monotonic() >= self.expires_at - _REFRESH_MARGIN:
+            async with self._lock:
+                if self.token is None or time.monotonic() >= self.expires_at - _REFRESH_MARGIN:
+                    await self._refresh(client)
+        return {"authorization": f"Bearer {self.token}"}
+
+    async def _refresh(self, client: httpx.AsyncClient) -> None:
+        response = await client.post(
+            settings.proxy_auth_token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": settings.proxy_auth_client_id,
+                "client_secret": settings.proxy_auth_client_secret,
+            },
+        )
+        response.raise_for_status()
+        payload = response.json()
+        self.token = payload["access_token"]
+        self.expires_at = time.monotonic() + float(payload.get("expires_in", 300))
+        logger.info("authorization token refreshed")
+
+    async def run_refresher(self, client: httpx.AsyncClient) -> None:
+        """Proactively refresh the token so requests never pay the round-trip."""
+        while True:
+            delay = max(self.expires_at - _REFRESH_MARGIN - time.monotonic(), 1.0)
+            await asyncio.sleep(delay)
+            try:
+                async with self._lock:
+                    await self._refresh(client)
+            except Exception as exc:
+                logger.warning("token refresh failed", details=str(exc))
+                await asyncio.sleep(5)
+
+
+token_cache = TokenCache()
+
+
+async def get_authorization_headers(client: httpx.AsyncClient) -> dict:
+    return await token_cache.get_headers(client)
@@ -0,0 +1,129 @@
+import fnmatch
+import os
+import re
+from functools import cached_property
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+_GLOB_CHARS_RE = re.compile(r"[*?\[]")
+
+
+class AppSettings(BaseSettings):
+    """Application settings, populated from environment variables or `.env`."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    app_name: str = "yallmp"
+    version: str = "0.1.0"
+    log_level: str = "INFO"
+    host: str = "0.0.0.0"
+    port: int = 8000
+
+    gzip_enabled: bool = True
+
+    # Max debug events per second allowed through per event name; 0 disables
+    # sampling entirely (every debug event is emitted).
+    log_sample_rate: float = 0.0
+    # Optional file sink for log records; empty means stdout.
+    log_file_path: str = ""
+
+    allowed_origins: tuple[str, ...] = ("*",)
+
+    metrics_path: str = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "/tmp/yallmp-metrics")
+
+    llm_hub_enabled: bool = True
+    llm_providers: list[dict] = []
+
+    # Requires the langchain extra; disabled unless explicitly configured.
+    chain_hub_enabled: bool = False
+    chain_default_base_url: str = ""
+    chain_default_json_file: str = "chains/default_llm.json"
+    chains_path: str = "chains"
+    chain_fallback_models: tuple[str, ...] = ()
+    # How long a model stays skipped after an upstream "no such model" before
+    # a request is allowed to probe it again.
+    chain_bad_model_cooldown: float = 30.0
+    chain_default_available_chat_models: frozenset[str] = frozenset()
+
+    @cached_property
+    def cors_wildcard(self) -> bool:
+        """True when any origin is ``*`` so origin checks can short-circuit."""
+        return "*" in self.allowed_origins
+
+    proxy_target_url: str = "http://localhost:8080"
+    proxy_auth_token_url: str = ""
+    proxy_auth_client_id: str = ""
+    proxy_auth_client_secret: str = ""
+    proxy_exclude_headers: str = (
+        "host,content-length,authorization,cookie,x-forwarded-*,jwt-*"
+    )
+    proxy_max_retries: int = 3
+    # Sized for completion fan-out bursts: too small a pool starves requests
+    # waiting for a connection long before the upstream is the bottleneck.
+    proxy_max_connections: int = 1000
+    proxy_max_keepalive: int = 100
+    # Matches common nginx keepalive_timeout defaults so idle upstream
+    # connections survive between proxy requests instead of re-handshaking.
+    proxy_keepalive_expiry: float = 75.0
+    # Fail fast on connect/pool-acquire; slow reads are expected (long
+    # completions), slow dials and pool starvation are not.
+    proxy_connect_timeout: float = 2.0
+    proxy_read_timeout: float = 60.0
+    proxy_write_timeout: float = 60.0
+    proxy_pool_timeout: float = 1.0
+    proxy_ca_bundle_path: str = ""
+
+    def _exclude_tokens(self) -> list[str]:
+        return [
+            token.strip().lower()
+            for token in self.proxy_exclude_headers.split(",")
+            if token.strip()
+        ]
+
+    @cached_property
+    def proxy_exclude_exact(self) -> frozenset[str]:
+        """Lowercased literal header names from ``proxy_exclude_headers``."""
+        return frozenset(
+            token for token in self._exclude_tokens() if not _GLOB_CHARS_RE.search(token)
+        )
+
+    @cached_property
+    def proxy_exclude_prefixes(self) -> tuple[str, ...]:
+        """Prefixes from trailing-wildcard patterns (``x-forwarded-*`` → ``x-forwarded-``)."""
+        return tuple(
+            token[:-1]
+            for token in self._exclude_tokens()
+            if token.endswith("*") and not _GLOB_CHARS_RE.search(token[:-1])
+        )
+
+    @cached_property
+    def proxy_exclude_re(self) -> "re.Pattern | None":
+        """One compiled alternation for the remaining (general) glob patterns.
+
+        Literals and plain prefixes are handled by the frozenset/startswith
+        fast paths above; anything else — ``x-*-token``, ``sec?id`` — is
+        translated via fnmatch once here, so matching a header is a single
+        regex scan instead of per-pattern fnmatch calls.
+        """
+        patterns = [
+            token
+            for token in self._exclude_tokens()
+            if _GLOB_CHARS_RE.search(token)
+            and not (token.endswith("*") and not _GLOB_CHARS_RE.search(token[:-1]))
+        ]
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+    proxy_base_delay: float = 0.5
+    proxy_max_delay: float = 30.0
+    proxy_failure_threshold: int = 5
+    proxy_recovery_time: float = 30.0
+    proxy_window_size: float = 60.0
+
+
+settings = AppSettings()
+
+# LangChain reads its defaults from the environment; only export them when the
+# chain hub is actually in use so minimal deployments keep a clean environment.
+if settings.chain_hub_enabled and settings.chain_default_base_url:
+    os.environ["LLM_CHAIN_DEFAULT_BASE_URL"] = settings.chain_default_base_url
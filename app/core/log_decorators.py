@@ -0,0 +1,174 @@
+import functools
+import inspect
+import traceback
+
+import structlog
+from structlog.contextvars import bound_contextvars
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_async(func_id, func):
+    """Memoized coroutine check for stacked/re-applied decorations.
+
+    Uses inspect.iscoroutinefunction (the asyncio variant is deprecated) and
+    caches by id; the function itself is carried along so the cached id stays
+    valid for as long as the entry exists.
+    """
+    return inspect.iscoroutinefunction(func)
+
+
+def _call_and_log(func, args, kwargs, log):
+    """Shared call body for exception-logging wrappers (sync flavour)."""
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        # No str(e) here: the exception object is serialized off-thread by the
+        # writer's default=repr hook, keeping the raise path cheap.
+        log.error(
+            "Error in function",
+            error=e,
+            error_type=type(e).__name__,
+            tb=traceback.format_exc(),
+        )
+        raise
+
+
+async def _acall_and_log(func, args, kwargs, log):
+    """Shared call body for exception-logging wrappers (async flavour)."""
+    try:
+        return await func(*args, **kwargs)
+    except Exception as e:
+        # No str(e) here: the exception object is serialized off-thread by the
+        # writer's default=repr hook, keeping the raise path cheap.
+        log.error(
+            "Error in function",
+            error=e,
+            error_type=type(e).__name__,
+            tb=traceback.format_exc(),
+        )
+        raise
+
+
+def log_context(**context):
+    """Bind a static logging context around every call of the decorated function."""
+
+    def decorator(func):
+        # The context never changes, so the kwargs are bound into a partial
+        # once here instead of being re-unpacked on every call.
+        binder = functools.partial(bound_contextvars, **context)
+        if _is_async(id(func), func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with binder():
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with binder():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+#: Compiled wrapper factories shared between identical decorations,
+#: keyed by (key_to_idx, is_async).
+_wrapper_factories: dict = {}
+
+
+def _compile_wrapper_factory(key_to_idx, is_async):
+    """Generate a wrapper specialized to the exact context keys.
+
+    ``key_to_idx`` maps each context key to the decorated function's real
+    positional index (or None for keyword-only/absent parameters), so the
+    mapping from (args, kwargs) to the bind dict is fully known and the
+    wrapper body is emitted as straight-line code — no signature walk, no
+    generic loop, just LOAD_FAST and literal-key dict stores.
+    """
+    cache_key = (key_to_idx, is_async)
+    factory = _wrapper_factories.get(cache_key)
+    if factory is not None:
+        return factory
+
+    lines = ["def factory(func, bound_contextvars):"]
+    lines.append(
+        "    async def wrapper(*args, **kwargs):"
+        if is_async
+        else "    def wrapper(*args, **kwargs):"
+    )
+    lines.append("        ctx = {}")
+    for key, idx in key_to_idx:
+        lines.append(f"        if {key!r} in kwargs: ctx[{key!r}] = kwargs[{key!r}]")
+        if idx is not None:
+            lines.append(f"        elif len(args) > {idx}: ctx[{key!r}] = args[{idx}]")
+    lines.append("        with bound_contextvars(**ctx):")
+    lines.append(
+        "            return await func(*args, **kwargs)"
+        if is_async
+        else "            return func(*args, **kwargs)"
+    )
+    lines.append("    return wrapper")
+
+    namespace: dict = {}
+    exec("\n".join(lines), namespace)  # noqa: S102 - trusted, locally built source
+    factory = namespace["factory"]
+    _wrapper_factories[cache_key] = factory
+    return factory
+
+
+def log_dynamic_context(*context_keys):
+    """Bind selected call arguments as logging context.
+
+    Each key in ``context_keys`` is looked up in the call's kwargs, falling
+    back to the positional slot the parameter actually occupies in the
+    decorated function's signature — resolved once at decoration time, so
+    argument order no longer has to match the key order. The wrapper body is
+    code-generated once per distinct (key, index) mapping.
+    """
+
+    def decorator(func):
+        # Only parameters that can actually be filled positionally get an
+        # index: keyword-only and post-*args parameters never occupy a
+        # positional slot, so giving them one would bind a stray vararg into
+        # the context.
+        positional_idx: dict[str, int] = {}
+        for i, param in enumerate(inspect.signature(func).parameters.values()):
+            if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                break
+            positional_idx[param.name] = i
+        key_to_idx = tuple((key, positional_idx.get(key)) for key in context_keys)
+        factory = _compile_wrapper_factory(key_to_idx, _is_async(id(func), func))
+        return functools.wraps(func)(factory(func, bound_contextvars))
+
+    return decorator
+
+
+def log_with_context_and_exceptions(**context):
+    """Like ``log_context`` but also logs any raised exception before re-raising."""
+
+    def decorator(func):
+        binder = functools.partial(bound_contextvars, **context)
+        # The empty bind forces the lazy proxy to assemble a real BoundLogger
+        # once, cached in this closure, instead of re-resolving per call.
+        log = structlog.get_logger().bind()
+        if _is_async(id(func), func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with binder():
+                    return await _acall_and_log(func, args, kwargs, log)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with binder():
+                return _call_and_log(func, args, kwargs, log)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,240 @@
+import atexit
+import importlib.util
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+import orjson
+import structlog
+
+from app.core.config import settings
+
+#: Hot paths only enqueue the event dict; serialization and the write syscall
+#: happen on a single background thread, off the request path.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+
+#: Batch-flush thresholds for the writer thread: drain to the fd once the
+#: buffer passes this size or this much time after the first buffered record.
+_FLUSH_BYTES = 65536
+_FLUSH_INTERVAL = 0.01
+
+#: Sentinel asking the writer to flush immediately and signal completion.
+_FLUSH = object()
+_flush_done = threading.Event()
+
+
+def _open_sink():
+    """Resolve the writer's output target to a ``(fd, write)`` pair.
+
+    Stdout by default; with ``log_file_path`` set, an appended file. On Linux
+    with the optional ``aio_uring`` package installed, file writes go through
+    io_uring so flushed batches are submitted asynchronously instead of
+    blocking the writer thread on each ``write`` syscall.
+    """
+    path = settings.log_file_path
+    if not path:
+        return sys.stdout.fileno(), os.write
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    if sys.platform == "linux" and importlib.util.find_spec("aio_uring") is not None:
+        from aio_uring import UringFileIO
+
+        uring = UringFileIO(fd, batch=32, timeout_us=100)
+        return fd, lambda _fd, buf: uring.write(bytes(buf))
+    return fd, os.write
+
+
+def _writer_loop() -> None:
+    # Raw fd writes, coalesced: records accumulate in a bytearray and go out
+    # in one syscall per batch instead of one per record. The buffer is owned
+    # exclusively by this thread, so no locking is needed.
+    fd, write = _open_sink()
+    get = _log_queue.get
+    monotonic = time.monotonic
+    buf = bytearray()
+    deadline = 0.0
+    while True:
+        if buf:
+            try:
+                event_dict = get(timeout=max(deadline - monotonic(), 0.0))
+            except queue.Empty:
+                write(fd, buf)
+                buf.clear()
+                continue
+        else:
+            event_dict = get()
+            deadline = monotonic() + _FLUSH_INTERVAL
+        if event_dict is _FLUSH:
+            if buf:
+                write(fd, buf)
+                buf.clear()
+            _flush_done.set()
+            continue
+        # default=repr lets arbitrary objects (exceptions, paths, models) ride
+        # along in log kwargs without callers pre-coercing them on hot paths.
+        buf += orjson.dumps(event_dict, default=repr)
+        buf += b"\n"
+        if len(buf) >= _FLUSH_BYTES:
+            write(fd, buf)
+            buf.clear()
+
+
+def _flush_logs(timeout: float = 0.5) -> None:
+    """Ask the writer thread to drain its buffer; waits up to ``timeout``.
+
+    Registered via atexit, which also covers SIGTERM under uvicorn (it turns
+    the signal into a normal interpreter shutdown).
+    """
+    _flush_done.clear()
+    _log_queue.put_nowait(_FLUSH)
+    _flush_done.wait(timeout)
+
+
+class _CachedISOTimeStamper:
+    """ISO-8601 timestamper that caches the second-level prefix.
+
+    At high log rates most events share the same wall-clock second; only the
+    microsecond tail is formatted per event. Benign under races: concurrent
+    writers recompute the same prefix.
+    """
+
+    __slots__ = ("_last_sec", "_prefix")
+
+    def __init__(self):
+        self._last_sec = -1
+        self._prefix = ""
+
+    def __call__(self, logger, name, event_dict):
+        now = time.time()
+        sec = int(now)
+        if sec != self._last_sec:
+            self._prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._last_sec = sec
+        event_dict["timestamp"] = f"{self._prefix}.{int((now - sec) * 1e6):06d}Z"
+        return event_dict
+
+
+class _DebugSampler:
+    """Token-bucket sampler that caps debug volume per event name.
+
+    Debug logging in hot paths scales serialization cost with call rate; this
+    drops excess events before the timestamper and queue ever see them. Each
+    distinct event name gets its own bucket refilled at
+    ``settings.log_sample_rate`` events per second (burst of the same size).
+    """
+
+    __slots__ = ("_rate", "_burst", "_buckets")
+
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._burst = max(rate, 1.0)
+        # event name -> [tokens, last_refill]; single dict, no lock — worst
+        # case under a race is one extra event slipping through.
+        self._buckets: dict = {}
+
+    def __call__(self, logger, name, event_dict):
+        if name != "debug":
+            return event_dict
+        key = event_dict.get("event", "")
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [self._burst - 1.0, now]
+            return event_dict
+        tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            raise structlog.DropEvent
+        bucket[0] = tokens - 1.0
+        return event_dict
+
+
+_LEVEL_ALIASES = {"exception": "error", "warn": "warning"}
+
+
+def _enqueue(logger, name, event_dict):
+    # Fold level injection into the terminal processor: one dict write here
+    # replaces the separate add_log_level hop for every record.
+    event_dict["level"] = _LEVEL_ALIASES.get(name, name)
+    _log_queue.put_nowait(event_dict)
+    raise structlog.DropEvent
+
+
+def _compose_processors(processors):
+    """Collapse a processor list into one generated function.
+
+    structlog iterates its processor list per event; for a chain known at
+    configure time the calls can instead be inlined into a single body, so
+    each record pays one call plus the processors themselves — no loop, no
+    per-step dispatch. Processors are bound as default arguments to make them
+    local-variable loads inside the generated function.
+    """
+    names = [f"_p{i}" for i in range(len(processors))]
+    lines = [f"def composed(logger, name, event_dict, {', '.join(f'{n}={n}' for n in names)}):"]
+    for n in names[:-1]:
+        lines.append(f"    event_dict = {n}(logger, name, event_dict)")
+    lines.append(f"    return {names[-1]}(logger, name, event_dict)")
+    namespace = dict(zip(names, processors))
+    exec("\n".join(lines), namespace)  # noqa: S102 - trusted, locally built source
+    return namespace["composed"]
+
+
+# Plain boolean, no lock: configuration happens on first import, and module
+# imports are serialized by the interpreter's import lock. Keep this module as
+# the single place that calls structlog.configure — a second configure call
+# would invalidate every cached logger.
+_configured = False
+
+
+def setup_logging():
+    """Configure structlog to emit JSON log lines to stdout.
+
+    Idempotent: repeated calls (tests, reloads, multiple create_app variants)
+    reconfigure nothing and just return a logger.
+    """
+    global _configured
+    if _configured:
+        return structlog.get_logger()
+    _configured = True
+
+    threading.Thread(target=_writer_loop, name="log-writer", daemon=True).start()
+    atexit.register(_flush_logs)
+
+    # Third-party libraries still funnel through stdlib logging; the app's own
+    # records bypass it entirely below.
+    logging.basicConfig(
+        format="%(message)s",
+        stream=sys.stderr,
+        level=logging.WARNING,
+    )
+
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        _CachedISOTimeStamper(),
+        # Stack/exc_info rendering is deliberately absent: every info call
+        # would pay the key checks. Error paths attach a preformatted
+        # traceback themselves (see log_decorators).
+        _enqueue,
+    ]
+    if settings.log_sample_rate > 0:
+        # First in the chain so dropped debug events pay for nothing beyond
+        # the bucket lookup itself.
+        processors.insert(0, _DebugSampler(settings.log_sample_rate))
+
+    structlog.configure(
+        # A single-element list: the whole chain runs as one generated call.
+        processors=[_compose_processors(processors)],
+        # Static level filtering: sub-threshold calls are no-ops instead of
+        # running the processor chain. Reconfiguring stdlib logging levels at
+        # runtime does not affect structlog output.
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.getLevelName(settings.log_level.upper())
+        ),
+        logger_factory=structlog.BytesLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+    return structlog.get_logger()
@@ -0,0 +1,80 @@
+import os
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+
+from app.core.config import settings
+
+#: Cached encoded scrape output. Under multiprocess mode every scrape walks
+#: and merges all per-process ``.db`` files; a short TTL keyed on their mtime
+#: collapses that to a single ``os.scandir`` when nothing has changed.
+_CACHE_TTL = 1.0
+_cached_bytes: bytes = b""
+_last_mtime: int = -1
+_last_ts: float = 0.0
+
+
+def _multiproc_dir() -> str | None:
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or settings.metrics_path
+    return path if path and os.path.isdir(path) else None
+
+
+def _generate_multiproc() -> bytes:
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def render_metrics() -> bytes:
+    """Return the encoded Prometheus scrape payload, cached briefly.
+
+    The cache is keyed on the newest mtime in the multiprocess directory and
+    expires after ``_CACHE_TTL`` seconds — well under the typical 15 s scrape
+    interval, so staleness is never observable by Prometheus.
+    """
+    global _cached_bytes, _last_mtime, _last_ts
+
+    mp_dir = _multiproc_dir()
+    if mp_dir is None:
+        return generate_latest()
+
+    now = time.monotonic()
+    mtime = max(
+        (entry.stat().st_mtime_ns for entry in os.scandir(mp_dir)), default=0
+    )
+    if mtime == _last_mtime and now - _last_ts < _CACHE_TTL:
+        return _cached_bytes
+
+    _cached_bytes = _generate_multiproc()
+    _last_mtime = mtime
+    _last_ts = now
+    return _cached_bytes
+
+
+class MetricsEndpoint:
+    """Raw ASGI endpoint serving Prometheus metrics.
+
+    Registered as an ASGI app (not a request handler) so scrapes bypass
+    FastAPI's routing/dependency machinery. The middleware stack still wraps
+    it — ``add_middleware`` wraps the whole app, routes included — so the
+    logging and Prometheus middleware skip ``/metrics`` explicitly instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        payload = render_metrics()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", CONTENT_TYPE_LATEST.encode()),
+                    (b"content-length", str(len(payload)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+
+metrics_asgi = MetricsEndpoint()
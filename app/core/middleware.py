@@ -0,0 +1,129 @@
+import functools
+import re
+import time
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+logger = structlog.get_logger()
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "Total count of HTTP requests",
+    ["method", "endpoint", "status_code"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration in seconds",
+    ["method", "endpoint"],
+)
+
+#: Prebound label children. ``.labels()`` re-validates kwargs and hashes a
+#: tuple into prometheus_client's metric map on every call; the child handles
+#: it returns are stable, so they are cached here and the per-request cost
+#: becomes one dict lookup. Keys: (method, endpoint[, status_code]).
+_COUNT_CACHE: dict = {}
+_DURATION_CACHE: dict = {}
+
+_PATH_ID_RE = re.compile(r"/(?:\d+|[0-9a-fA-F-]{32,})(?=/|$)", re.ASCII)
+
+#: Operational endpoints that are polled by infrastructure (Prometheus, load
+#: balancers); logging them would only produce noise and per-scrape overhead.
+_BYPASS_PATHS = frozenset({"/metrics", "/health", "/status", "/healthz", "/ready"})
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_path(path: str) -> str:
+    """Collapse numeric/uuid path segments so metric cardinality stays bounded.
+
+    The set of normalized paths a service serves is small and stable, so the
+    regex runs once per distinct raw path and repeats are a dict hit. The
+    cache is bounded for the same reason the substitution exists: unbounded
+    client-controlled paths must not grow memory without limit.
+    """
+    return _PATH_ID_RE.sub("/:id", path)
+
+
+class LoggingMiddleware:
+    """Pure ASGI middleware that logs each HTTP request with its duration.
+
+    Implemented directly against the ASGI protocol (no ``BaseHTTPMiddleware``)
+    so no extra task or memory channel is created per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in _BYPASS_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_holder = {"status": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+                duration_ms = (time.perf_counter() - start) * 1000
+                headers = message.setdefault("headers", [])
+                headers.append((b"x-response-time", f"{duration_ms:.2f}ms".encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            logger.info(
+                "request handled",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_holder["status"],
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            )
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware recording request count and duration metrics.
+
+    Reads method/path straight from the scope and the status code from the
+    ``http.response.start`` message, avoiding Request/Response construction.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Skip the scrape endpoint itself: recording ('GET', '/metrics', 200)
+        # once per scrape is pure self-measurement noise.
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        endpoint = _normalize_path(scope["path"])
+        start = time.perf_counter()
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            status = status_holder["status"]
+            key = (method, endpoint, status)
+            counter = _COUNT_CACHE.get(key)
+            if counter is None:
+                counter = _COUNT_CACHE.setdefault(
+                    key, REQUEST_COUNT.labels(method, endpoint, status)
+                )
+            counter.inc()
+            dkey = (method, endpoint)
+            hist = _DURATION_CACHE.get(dkey)
+            if hist is None:
+                hist = _DURATION_CACHE.setdefault(
+                    dkey, REQUEST_DURATION.labels(method, endpoint)
+                )
+            hist.observe(time.perf_counter() - start)
@@ -0,0 +1,824 @@
+import asyncio
+import email.utils
+import functools
+import logging
+import random
+import ssl
+import time
+
+import httpx
+import orjson
+import structlog
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+from app.core.security import redact_headers
+from app.services.llm_hub import Provider
+
+logger = structlog.get_logger()
+
+# Local aliases: orjson parses/encodes several times faster than stdlib json
+# and dumps straight to bytes, which this module forwards as-is.
+_loads = orjson.loads
+_dumps = orjson.dumps
+
+#: The log level is static for the process (see logging_config), so whether
+#: debug records can ever be emitted is a constant — evaluated once here and
+#: used to skip redact_headers() and string building entirely when debug is
+#: off.
+_DEBUG_ENABLED = logging.getLevelName(settings.log_level.upper()) <= logging.DEBUG
+
+#: vDSO-fast monotonic read without the module attribute hop per call.
+_monotonic = time.monotonic
+
+#: Dedicated per-process RNG (fresh OS-entropy seed, so workers don't share a
+#: jitter sequence) bound past the thread-safe module singleton's dispatch.
+_rng = random.Random()
+_rand = _rng.random
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """Build the single shared upstream client.
+
+    Must be constructed exactly once (from lifespan, which also owns the
+    matching ``aclose`` on shutdown) and reused for every proxy call via
+    ``app.state.client``: connection reuse and HTTP/2 multiplexing to the
+    upstream LLM avoid a TLS handshake per request. Never construct a client
+    per request — that allocates a fresh pool and pays the handshake every
+    time. The SSL context is built here, once, rather than per request.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.proxy_max_connections,
+        max_keepalive_connections=settings.proxy_max_keepalive,
+        keepalive_expiry=settings.proxy_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.proxy_connect_timeout,
+        read=settings.proxy_read_timeout,
+        write=settings.proxy_write_timeout,
+        pool=settings.proxy_pool_timeout,
+    )
+    ssl_context = ssl.create_default_context(
+        cafile=settings.proxy_ca_bundle_path or None
+    )
+    from app.core.transport import AiohttpTransport, aiohttp
+
+    if aiohttp is not None:
+        # aiohttp's connector holds up far better under concurrent fan-out
+        # than httpx's pool; the httpx call surface stays identical.
+        transport = AiohttpTransport(
+            limit=settings.proxy_max_connections,
+            keepalive_timeout=settings.proxy_keepalive_expiry,
+            ssl_context=ssl_context,
+            connect_timeout=settings.proxy_connect_timeout,
+            read_timeout=settings.proxy_read_timeout,
+        )
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+    return httpx.AsyncClient(
+        http2=True, limits=limits, timeout=timeout, verify=ssl_context
+    )
+
+
+class RollingCounter:
+    """Fixed ring of time buckets counting events over a sliding window.
+
+    Hystrix-style segmented counting: ``incr`` hashes the current time into
+    one of ``buckets`` slots and bumps an int, lazily recycling slots whose
+    epoch has passed — O(1) per event and memory bounded at ``buckets`` ints,
+    where a per-event timestamp list grows with the failure rate exactly when
+    the upstream is already in trouble. The trade-off is quantization: the
+    effective window wanders by up to one bucket span.
+    """
+
+    __slots__ = ("_size", "_span", "_counts", "_epochs")
+
+    def __init__(self, window: float, buckets: int = 10):
+        self._size = buckets
+        self._span = window / buckets
+        self._counts = [0] * buckets
+        self._epochs = [0] * buckets
+
+    def incr(self, now: float) -> None:
+        epoch = int(now / self._span)
+        idx = epoch % self._size
+        if self._epochs[idx] != epoch:
+            self._epochs[idx] = epoch
+            self._counts[idx] = 1
+        else:
+            self._counts[idx] += 1
+
+    def total(self, now: float) -> int:
+        oldest = int(now / self._span) - self._size + 1
+        counts = self._counts
+        epochs = self._epochs
+        return sum(counts[i] for i in range(self._size) if epochs[i] >= oldest)
+
+    def reset(self) -> None:
+        for i in range(self._size):
+            self._counts[i] = 0
+            self._epochs[i] = 0
+
+
+class CircuitBreaker:
+    """Sliding-window circuit breaker shared by all proxied requests.
+
+    Opens after ``failure_threshold`` failures within ``window_size`` seconds
+    and stays open for ``recovery_time`` seconds. Recovery goes through a
+    half-open probe: once the recovery time elapses, exactly one request is
+    let through while everyone else keeps failing fast — its success closes
+    the breaker, its failure restarts the open timer. Without the single
+    probe, every caller queued on the breaker would hit the still-fragile
+    upstream simultaneously the instant the timer expired.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.is_open = False
+        self.open_time = 0.0
+        # Thresholds are resolved once: settings are immutable at runtime and
+        # pydantic attribute access is too expensive to pay under the lock.
+        self.failure_threshold = settings.proxy_failure_threshold
+        self.recovery_time = settings.proxy_recovery_time
+        self.window_size = settings.proxy_window_size
+        self.failures = RollingCounter(self.window_size)
+        # GIL-atomic flag letting record_success skip the lock entirely on
+        # the success-after-success steady state.
+        self._failures_seen = False
+        # True while the one half-open probe request is out. is_open stays
+        # True in half-open so the lock-free closed fast path stays a single
+        # bool read. The deadline bounds how long a probe may stay
+        # unreported: a cancelled probe (client disconnect, shutdown) would
+        # otherwise leave the flag stuck and the breaker wedged open.
+        self._probe_in_flight = False
+        self._probe_deadline = 0.0
+
+    async def check_open(self) -> bool:
+        # Steady state is a closed breaker; a plain bool read is atomic under
+        # the GIL, so the closed path takes no lock at all. The lock is only
+        # needed to serialize the open -> closed recovery transition.
+        if not self.is_open:
+            return False
+        async with self._lock:
+            if not self.is_open:
+                return False
+            now = _monotonic()
+            if self._probe_in_flight:
+                if now < self._probe_deadline:
+                    return True
+                # The probe never reported back (cancelled mid-flight);
+                # treat it as lost and admit a replacement below.
+            elif now - self.open_time < self.recovery_time:
+                return True
+            # Recovery time elapsed: admit exactly this caller as the probe.
+            self._probe_in_flight = True
+            self._probe_deadline = now + self.recovery_time
+            return False
+
+    async def record_failure(self) -> None:
+        opened = 0
+        async with self._lock:
+            current_time = _monotonic()
+            self.failures.incr(current_time)
+            self._failures_seen = True
+            if self._probe_in_flight:
+                # The probe failed: restart the open timer and go back to
+                # failing fast.
+                self._probe_in_flight = False
+                self.open_time = current_time
+                opened = -1
+            else:
+                total = self.failures.total(current_time)
+                if total >= self.failure_threshold:
+                    self.is_open = True
+                    self.open_time = current_time
+                    opened = total
+        # Emit outside the critical section; the lock only needs to cover
+        # state, not the log pipeline.
+        if opened == -1:
+            logger.warning("circuit breaker probe failed, reopening")
+        elif opened:
+            logger.warning("circuit breaker opened", failures=opened)
+
+    async def record_success(self) -> None:
+        # Nothing to clear on the overwhelmingly common success-after-success
+        # path; skip the lock entirely.
+        if not self._failures_seen:
+            return
+        closed = False
+        async with self._lock:
+            self.failures.reset()
+            self._failures_seen = False
+            if self.is_open:
+                # Only the probe (or a request already in flight when the
+                # breaker opened) can get here; either way the upstream
+                # answered, so close.
+                self.is_open = False
+                self._probe_in_flight = False
+                closed = True
+        if closed:
+            logger.info("circuit breaker closed")
+
+    def get_status(self) -> dict:
+        if not self.is_open:
+            state = "closed"
+        elif self._probe_in_flight:
+            state = "half_open"
+        else:
+            state = "open"
+        return {
+            "is_open": self.is_open,
+            "state": state,
+            "failures": self.failures.total(_monotonic()),
+        }
+
+
+circuit_breaker = CircuitBreaker()
+
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_SUCCESS_STATUS = frozenset(range(200, 209)) | {226}
+
+#: Shared read-only default so `custom_headers or {}` call sites do not
+#: allocate a fresh dict per request.
+_EMPTY_HEADERS: dict = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _base_url() -> str:
+    """Default proxy target with the trailing slash normalized away, cached
+    so the hot path skips the pydantic attribute walk per request."""
+    return settings.proxy_target_url.rstrip("/")
+
+
+def _parse_retry_after(value: str) -> float:
+    """Seconds to wait for a ``Retry-After`` header, either RFC 7231 form.
+
+    The delta-seconds form is the overwhelmingly common one and costs a
+    single ``isdigit`` check; the HTTP-date form falls back to a parse
+    relative to wall-clock now. Unparseable values yield 0.0 so the caller's
+    own backoff takes over. The server's value is honored verbatim — adding
+    jitter on top would push retries past the window it asked for.
+    """
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, dt.timestamp() - time.time())
+
+
+async def exponential_backoff_retry(func, *args, **kwargs):
+    """Call ``func`` retrying retryable HTTP statuses with backoff.
+
+    Delays follow the decorrelated-jitter scheme
+    (``uniform(base, prev * 3)`` capped at ``proxy_max_delay``): growth stays
+    roughly exponential but retriers spread out instead of synchronizing on
+    the same deterministic peaks and hammering a recovering upstream in
+    waves.
+
+    Safe for streamed sends: status codes are inspected before any body read,
+    the winning response is returned unconsumed, and responses abandoned for
+    a retry are closed so their connections go back to the pool.
+    """
+    _max_retries = settings.proxy_max_retries
+    _base_delay = settings.proxy_base_delay
+    _cap_delay = settings.proxy_max_delay
+    _sleep = asyncio.sleep
+
+    if await circuit_breaker.check_open():
+        return ORJSONResponse(
+            content={"detail": "Upstream temporarily unavailable"}, status_code=503
+        )
+
+    response = None
+    prev_delay = _base_delay
+    for attempt in range(_max_retries + 1):
+        try:
+            response = await func(*args, **kwargs)
+        except httpx.TransportError as exc:
+            await circuit_breaker.record_failure()
+            if attempt == _max_retries:
+                raise
+            delay = min(_cap_delay, _base_delay + _rand() * (prev_delay * 3.0 - _base_delay))
+            prev_delay = delay
+            logger.warning("Connection failed", details=str(exc))
+            logger.debug("retrying request", delay=delay)
+            await _sleep(delay)
+            continue
+
+        sc = response.status_code
+        if sc not in _RETRYABLE_STATUS:
+            await circuit_breaker.record_success()
+            return response
+        await circuit_breaker.record_failure()
+        if attempt == _max_retries:
+            return response
+        retry_after = (
+            _parse_retry_after(response.headers["retry-after"])
+            if sc == 429 and "retry-after" in response.headers
+            else 0.0
+        )
+        if retry_after > 0.0:
+            delay = retry_after
+            logger.debug("rate limited, retrying", delay=delay)
+        else:
+            delay = min(_cap_delay, _base_delay + _rand() * (prev_delay * 3.0 - _base_delay))
+            prev_delay = delay
+            logger.debug("retrying request", delay=delay)
+        await response.aclose()
+        await _sleep(delay)
+    return response
+
+
+async def _send_with_connect_retry(client: httpx.AsyncClient, upstream_request):
+    """Send a streamed request, retrying connect-stage failures only.
+
+    Once request bytes may have reached the upstream, replaying through this
+    proxy is not safe — so unlike ``exponential_backoff_retry`` this never
+    retries on status codes, only on errors raised before a connection was
+    established.
+    """
+    _max_retries = settings.proxy_max_retries
+    _base_delay = settings.proxy_base_delay
+    _cap_delay = settings.proxy_max_delay
+    _sleep = asyncio.sleep
+
+    prev_delay = _base_delay
+    for attempt in range(_max_retries + 1):
+        try:
+            response = await client.send(upstream_request, stream=True)
+        except httpx.ConnectError as exc:
+            await circuit_breaker.record_failure()
+            if attempt == _max_retries:
+                raise
+            delay = min(_cap_delay, _base_delay + _rand() * (prev_delay * 3.0 - _base_delay))
+            prev_delay = delay
+            logger.warning("Connection failed", details=str(exc))
+            await _sleep(delay)
+            continue
+        await circuit_breaker.record_success()
+        return response
+
+
+#: Byte variants of the exclude sets for the raw-header path below. ASGI
+#: servers hand Starlette already-lowercased latin-1 keys, so no per-header
+#: lower()/decode is needed. accept-encoding is excluded up front because
+#: every forward path pins it to identity.
+_EXCLUDE_EXACT_B = frozenset(
+    s.encode("latin-1") for s in settings.proxy_exclude_exact
+) | {b"accept-encoding"}
+_EXCLUDE_PREFIXES_B = tuple(
+    s.encode("latin-1") for s in settings.proxy_exclude_prefixes
+)
+
+
+def _filter_raw_headers(raw: list) -> list:
+    """Filtered copy of an ASGI raw-header list (lowercase bytes pairs).
+
+    Works on ``request.headers.raw`` directly, so forwarding skips Starlette's
+    per-header latin-1 decode and the dict materialization — and multi-valued
+    headers survive instead of collapsing to the last value.
+    """
+    exact = _EXCLUDE_EXACT_B
+    prefixes = _EXCLUDE_PREFIXES_B
+    pattern = settings.proxy_exclude_re
+    filtered = []
+    for k, v in raw:
+        if k in exact or (prefixes and k.startswith(prefixes)):
+            continue
+        if pattern is not None and pattern.match(k.decode("latin-1")):
+            continue
+        filtered.append((k, v))
+    return filtered
+
+
+def _raw_to_str_dict(raw: list) -> dict:
+    """Decode a raw-header list for the (debug-only) redacted log lines."""
+    return {k.decode("latin-1"): v.decode("latin-1") for k, v in raw}
+
+
+#: Hop-by-hop fields (RFC 7230 §6.1) describe the upstream connection, not
+#: the payload, and must not be relayed — forwarding Connection or
+#: Transfer-Encoding breaks HTTP/2 clients downstream.
+_HOP_BY_HOP = frozenset(
+    (
+        b"connection",
+        b"keep-alive",
+        b"proxy-authenticate",
+        b"proxy-authorization",
+        b"te",
+        b"trailer",
+        b"transfer-encoding",
+        b"upgrade",
+    )
+)
+
+
+def _forward_response_headers(response: httpx.Response) -> list:
+    """Upstream response headers ready to relay downstream.
+
+    Passes the raw (bytes, bytes) pairs straight through minus hop-by-hop
+    fields: no dict round-trip, and multi-valued headers like Set-Cookie
+    survive instead of collapsing to the last value.
+    """
+    return [(k, v) for k, v in response.headers.raw if k.lower() not in _HOP_BY_HOP]
+
+
+def extract_content(response: httpx.Response, max_bytes: int = 65536) -> dict:
+    """Parse a response body into a dict, bounding the non-JSON fallback.
+
+    Oversized bodies that cannot be JSON (an upstream error page, say) are
+    truncated to ``max_bytes`` before decoding instead of round-tripping
+    megabytes of HTML into an error envelope. Valid JSON of any size is
+    parsed in full — large completion payloads must come through intact.
+    """
+    content = response.content
+    if len(content) > max_bytes and content[:1] not in (b"{", b"["):
+        return {
+            "detail": content[:max_bytes].decode("utf-8", errors="replace"),
+            "truncated": True,
+        }
+    try:
+        return _loads(content)
+    except orjson.JSONDecodeError:
+        return {"detail": content[:max_bytes].decode("utf-8", errors="replace")}
+
+
+def _strip_model_prefix(body: bytes, original_model: str, stripped_model: str) -> bytes:
+    """Rewrite the ``model`` field so the upstream sees its own model name."""
+    payload = _loads(body)
+    payload["model"] = stripped_model
+    return _dumps(payload)
+
+
+#: Give up sniffing once this much body has arrived without a top-level
+#: model: uploads and huge tool schemas fall back to default routing instead
+#: of being buffered and scanned indefinitely.
+_SNIFF_LIMIT = 65536
+
+
+class _ModelSniffer:
+    """Incremental scanner for the top-level ``"model"`` key of a JSON body.
+
+    Fed chunk by chunk, it maintains string/escape/nesting state across
+    feeds, so no byte is ever rescanned and ``"model"`` keys nested inside
+    other objects (message metadata, tool schemas with a ``model`` property)
+    never match — only a key of the top-level object does.
+    """
+
+    __slots__ = ("_depth", "_in_str", "_esc", "_expect_key", "_key", "_want", "_value")
+
+    def __init__(self):
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        # True when the next depth-1 string is an object key.
+        self._expect_key = True
+        self._key = bytearray()
+        # True right after the top-level "model" key closed; the next string
+        # is its value. Any other token cancels it.
+        self._want = False
+        self._value: bytearray | None = None
+
+    def feed(self, chunk: bytes) -> str | None:
+        for b in chunk:
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif b == 0x5C:  # backslash
+                    self._esc = True
+                elif b == 0x22:  # closing quote
+                    self._in_str = False
+                    if self._value is not None:
+                        return self._value.decode()
+                    if self._depth == 1 and self._expect_key:
+                        self._want = self._key == b"model"
+                elif self._value is not None:
+                    self._value.append(b)
+                elif self._depth == 1 and self._expect_key:
+                    self._key.append(b)
+            elif b == 0x22:  # opening quote
+                self._in_str = True
+                if self._want:
+                    self._value = bytearray()
+                elif self._depth == 1 and self._expect_key:
+                    self._key.clear()
+            elif b in (0x7B, 0x5B):  # { [
+                self._depth += 1
+                self._want = False
+            elif b in (0x7D, 0x5D):  # } ]
+                self._depth -= 1
+            elif b == 0x3A:  # :
+                if self._depth == 1:
+                    self._expect_key = False
+            elif b == 0x2C:  # ,
+                self._want = False
+                if self._depth == 1:
+                    self._expect_key = True
+            elif b not in (0x20, 0x09, 0x0A, 0x0D):
+                # Non-string value (null, number, ...) after "model".
+                self._want = False
+        return None
+
+
+async def sniff_model(request: Request):
+    """Read the request body only as far as needed to find the model name.
+
+    Returns ``(prefix_bytes, remainder_stream, model)`` where the remainder
+    stream yields the not-yet-consumed chunks, so the caller can forward the
+    body without re-reading or fully buffering it. Bodies larger than
+    ``_SNIFF_LIMIT`` with no top-level model stop being scanned; the caller
+    gets the prefix plus the live stream and routes by default.
+    """
+    sniffer = _ModelSniffer()
+    buf = bytearray()
+    stream = request.stream()
+    async for chunk in stream:
+        buf.extend(chunk)
+        model = sniffer.feed(chunk)
+        if model is not None:
+            return bytes(buf), stream, model
+        if len(buf) >= _SNIFF_LIMIT:
+            return bytes(buf), stream, None
+    return bytes(buf), None, None
+
+
+async def _chain_body(prefix: bytes, stream):
+    yield prefix
+    if stream is not None:
+        async for chunk in stream:
+            yield chunk
+
+
+async def _drain_body(prefix: bytes, stream) -> bytes:
+    if stream is None:
+        return prefix
+    buf = bytearray(prefix)
+    async for chunk in stream:
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+async def _stream_generator(response: httpx.Response, model: str):
+    """Yield SSE chunks to the client, tracking the last data line as we go.
+
+    Only the final non-``[DONE]`` ``data:`` payload matters (it carries
+    ``usage``), so instead of buffering the whole stream for a post-hoc scan,
+    a rolling tail of the current incomplete line is kept and each completed
+    line updates ``last_data`` in place — O(1) memory, no decode, and chunks
+    are forwarded untouched.
+    """
+    tail = b""
+    last_data = None
+    try:
+        async for chunk in response.aiter_bytes():
+            # Skip the concat when there is no carried tail (the common case
+            # once chunks align with event boundaries).
+            lines = (tail + chunk).split(b"\n") if tail else chunk.split(b"\n")
+            tail = lines.pop()
+            # Scan completed lines from the end: only the last data line per
+            # chunk can win, so stop at the first match going backward.
+            for line in reversed(lines):
+                line = line.strip()
+                if line.startswith(b"data:") and line != b"data: [DONE]":
+                    last_data = line
+                    break
+            yield chunk
+    finally:
+        await response.aclose()
+        line = tail.strip()
+        if line.startswith(b"data:") and line != b"data: [DONE]":
+            last_data = line
+        _emit_streaming_metrics(last_data, model)
+
+
+def _emit_streaming_metrics(last_data: bytes | None, model: str) -> None:
+    """Log usage from the final SSE data payload (it carries ``usage``)."""
+    if last_data is None:
+        return
+    try:
+        payload = _loads(last_data[5:].strip())
+    except ValueError:
+        return
+    usage = payload.get("usage")
+    if usage:
+        logger.info("streaming usage", model=model, usage=usage)
+
+
+def trace_proxy_request(path: str, model: str | None, duration_ms: float, status_code: int) -> None:
+    """Emit a trace record for a proxied request."""
+    logger.info(
+        "proxy request",
+        path=path,
+        model=model,
+        duration_ms=round(duration_ms, 2),
+        status_code=status_code,
+    )
+
+
+async def proxy_request_to_provider(
+    request: Request,
+    provider: Provider,
+    path: str,
+    body_prefix: bytes,
+    body_stream,
+    model: str,
+    stripped_model: str,
+):
+    """Forward a model-routed request to the provider that owns the model."""
+    client: httpx.AsyncClient = request.app.state.client
+    target_url = f"{provider.base_url.rstrip('/')}/{path}"
+    if request.url.query:
+        target_url = f"{target_url}?{request.url.query}"
+
+    headers = _filter_raw_headers(request.headers.raw)
+    if provider.api_key:
+        headers.append((b"authorization", b"Bearer " + provider.api_key.encode()))
+    headers.append((b"accept-encoding", b"identity"))
+    if _DEBUG_ENABLED:
+        logger.debug(
+            "forwarding headers", headers=redact_headers(_raw_to_str_dict(headers))
+        )
+
+    if stripped_model != model:
+        # The upstream must see its own (unprefixed) model name, which means
+        # rewriting the body — so it has to be fully buffered first.
+        body = await _drain_body(body_prefix, body_stream)
+        body = _strip_model_prefix(body, model, stripped_model)
+        content = body
+    else:
+        content = _chain_body(body_prefix, body_stream)
+
+    start_time = _monotonic()
+    upstream_request = client.build_request(
+        request.method, target_url, headers=headers, content=content
+    )
+    response = await client.send(upstream_request, stream=True)
+
+    # The upstream's content-type is the authoritative streaming signal: the
+    # sniffed prefix only reliably reaches the model key, so a "stream" flag
+    # later in a multi-chunk body (or spaced differently than a byte match
+    # expects) would be missed and the whole SSE generation buffered.
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        return StreamingResponse(
+            _stream_generator(response, model),
+            status_code=response.status_code,
+            media_type="text/event-stream",
+        )
+
+    await response.aread()
+    await response.aclose()
+    duration_ms = (_monotonic() - start_time) * 1000
+    trace_proxy_request(path, model, duration_ms, response.status_code)
+    return ORJSONResponse(
+        content=extract_content(response),
+        status_code=response.status_code,
+    )
+
+
+async def proxy_request_with_retries(
+    request: Request, path: str, body: bytes | None = None, custom_headers=None
+):
+    """Forward a request to the default proxy target with retries."""
+    client: httpx.AsyncClient = request.app.state.client
+    if custom_headers is None:
+        custom_headers = _EMPTY_HEADERS
+    target_url = _base_url() + "/" + path
+    if request.url.query:
+        target_url = f"{target_url}?{request.url.query}"
+
+    if body is None:
+        body = await request.body()
+    # One parse for the whole request: streaming detection, model lookup and
+    # the trace record below all read from this dict.
+    body_json = None
+    if body:
+        try:
+            body_json = _loads(body)
+        except ValueError:
+            pass
+    is_streaming = body_json is not None and body_json.get("stream") is True
+
+    headers = _filter_raw_headers(request.headers.raw)
+    if custom_headers:
+        overrides = {k.lower().encode("latin-1") for k in custom_headers}
+        headers = [(k, v) for k, v in headers if k not in overrides]
+        headers.extend(
+            (k.encode("latin-1"), v.encode("latin-1"))
+            for k, v in custom_headers.items()
+        )
+    headers.append((b"accept-encoding", b"identity"))
+    if _DEBUG_ENABLED:
+        logger.debug(
+            "original headers",
+            headers=redact_headers(_raw_to_str_dict(request.headers.raw)),
+        )
+        logger.debug(
+            "forwarded headers", headers=redact_headers(_raw_to_str_dict(headers))
+        )
+
+    start_time = _monotonic()
+    if is_streaming:
+        upstream_request = client.build_request(
+            request.method, target_url, headers=headers, content=body
+        )
+        response = await client.send(upstream_request, stream=True)
+        model = body_json.get("model") if body_json else None
+        return StreamingResponse(
+            _stream_generator(response, model),
+            status_code=response.status_code,
+            media_type="text/event-stream",
+        )
+
+    if "completions" not in path:
+        # Pure passthrough: nothing on these paths feeds model tracing, so
+        # buffering the body just to parse and re-serialize it would only
+        # move every byte through the process twice. Stream it raw.
+        if await circuit_breaker.check_open():
+            return ORJSONResponse(
+                content={"detail": "Upstream temporarily unavailable"},
+                status_code=503,
+            )
+        upstream_request = client.build_request(
+            request.method, target_url, headers=headers, content=body
+        )
+        response = await _send_with_connect_retry(client, upstream_request)
+        passthrough = StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            background=BackgroundTask(response.aclose),
+        )
+        # Relay the upstream's own headers (content-type included) rather
+        # than synthesizing a fresh set.
+        passthrough.raw_headers = _forward_response_headers(response)
+        return passthrough
+
+    # Streamed send even for non-SSE completions: bytes flow to the client as
+    # they arrive instead of buffering the full body, so time-to-first-byte
+    # tracks the upstream's first chunk and peak memory is one chunk, not the
+    # whole response. The body is bytes, so replaying it on a retry is safe.
+    upstream_request = client.build_request(
+        request.method, target_url, headers=headers, content=body
+    )
+    response = await exponential_backoff_retry(
+        client.send, upstream_request, stream=True
+    )
+    if isinstance(response, ORJSONResponse):
+        # The circuit breaker short-circuited the call.
+        return response
+
+    duration_ms = (_monotonic() - start_time) * 1000
+    if response.status_code in _SUCCESS_STATUS:
+        trace_proxy_request(
+            path,
+            body_json.get("model") if body_json else None,
+            duration_ms,
+            response.status_code,
+        )
+    streamed = StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        background=BackgroundTask(response.aclose),
+    )
+    streamed.raw_headers = _forward_response_headers(response)
+    return streamed
+
+
+async def get_model_version(client: httpx.AsyncClient, custom_headers=None) -> dict:
+    """Fetch the upstream version descriptor."""
+    response = await client.get(
+        _base_url() + "/version",
+        headers=custom_headers if custom_headers is not None else _EMPTY_HEADERS,
+    )
+    return extract_content(response)
+
+
+async def stream_multipart_post(request: Request, path: str, custom_headers=None):
+    """Forward a multipart POST upstream, streaming the upload body."""
+    client: httpx.AsyncClient = request.app.state.client
+    if custom_headers is None:
+        custom_headers = _EMPTY_HEADERS
+    target_url = _base_url() + "/" + path
+
+    headers = _filter_raw_headers(request.headers.raw)
+    if custom_headers:
+        overrides = {k.lower().encode("latin-1") for k in custom_headers}
+        headers = [(k, v) for k, v in headers if k not in overrides]
+        headers.extend(
+            (k.encode("latin-1"), v.encode("latin-1"))
+            for k, v in custom_headers.items()
+        )
+
+    # request.stream() is already an async iterable of bytes, which httpx
+    # accepts directly — no adapter layer in the upload path. The upload
+    # side streams; the response side reads once into response.content, so
+    # there is no stream=True + manual aread double buffering.
+    upstream_request = client.build_request(
+        "POST", target_url, headers=headers, content=request.stream()
+    )
+    response = await client.send(upstream_request)
+    return ORJSONResponse(
+        content=extract_content(response), status_code=response.status_code
+    )
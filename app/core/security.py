@@ -0,0 +1,27 @@
+#: Frozenset membership beats a regex alternation here: the patterns are all
+#: plain literals, so each header costs one lower() + hash lookup instead of
+#: an NFA walk through Python's re machinery.
+_SENSITIVE_HEADERS = frozenset(
+    (
+        "authorization",
+        "proxy-authorization",
+        "cookie",
+        "set-cookie",
+        "x-api-key",
+        "api-key",
+    )
+)
+
+
+def _redact_value(value: str) -> str:
+    if len(value) <= 8:
+        return "***"
+    return value[:4] + "***" + value[-2:]
+
+
+def redact_headers(headers: dict) -> dict:
+    """Return a copy of ``headers`` with sensitive values masked for logging."""
+    return {
+        k: _redact_value(str(v)) if k.lower() in _SENSITIVE_HEADERS else v
+        for k, v in headers.items()
+    }
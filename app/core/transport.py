@@ -0,0 +1,95 @@
+"""aiohttp-backed transport for the shared httpx client.
+
+httpx's own async connection pool serializes on an internal lock and becomes
+the bottleneck once a few dozen proxy requests are in flight. aiohttp's
+connector scales much better under that load, so when aiohttp is available the
+upstream client keeps its httpx surface (build_request/send/stream all work
+unchanged) but routes I/O through an ``aiohttp.ClientSession``.
+"""
+
+import asyncio
+
+import httpx
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp is an optional speedup
+    aiohttp = None
+
+
+class AiohttpResponseStream(httpx.AsyncByteStream):
+    """Adapt an aiohttp response body to httpx's async byte stream."""
+
+    def __init__(self, resp):
+        self._resp = resp
+
+    async def __aiter__(self):
+        async for chunk in self._resp.content.iter_chunked(65536):
+            yield chunk
+
+    async def aclose(self) -> None:
+        self._resp.release()
+
+
+class AiohttpTransport(httpx.AsyncBaseTransport):
+    """Translate httpx requests onto a pooled ``aiohttp.ClientSession``.
+
+    ``auto_decompress`` is disabled so content-encoding flows through
+    untouched and httpx's own decoding stays correct.
+    """
+
+    def __init__(self, *, limit, keepalive_timeout, ssl_context, connect_timeout, read_timeout):
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit,
+            keepalive_timeout=keepalive_timeout,
+            ssl=ssl_context,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            auto_decompress=False,
+            timeout=aiohttp.ClientTimeout(
+                total=None, connect=connect_timeout, sock_read=read_timeout
+            ),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        data = request.stream
+        if request.headers.get("content-length") == "0":
+            data = None
+        headers = request.headers
+        if "transfer-encoding" in headers:
+            # httpx stamps Transfer-Encoding: chunked on unknown-length
+            # streams, but aiohttp manages framing itself and rejects the
+            # explicit header alongside its own chunked upload mode.
+            headers = headers.copy()
+            del headers["transfer-encoding"]
+        try:
+            resp = await self._session.request(
+                request.method,
+                str(request.url),
+                headers=headers,
+                data=data,
+                allow_redirects=False,
+            )
+        except (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError) as exc:
+            # Connector-stage failures only: no request bytes reached the
+            # upstream, so connect-only retry logic (_send_with_connect_retry)
+            # may safely replay the request.
+            raise httpx.ConnectError(str(exc), request=request) from exc
+        except (aiohttp.SocketTimeoutError, asyncio.TimeoutError) as exc:
+            raise httpx.ReadTimeout(str(exc), request=request) from exc
+        except aiohttp.ClientError as exc:
+            # Everything else (server disconnect, payload errors) happened
+            # after bytes may have flowed — surface as a read failure so it
+            # is never mistaken for a safely-replayable connect error.
+            raise httpx.ReadError(str(exc), request=request) from exc
+        return httpx.Response(
+            status_code=resp.status,
+            headers=list(resp.headers.items()),
+            stream=AiohttpResponseStream(resp),
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._session.close()
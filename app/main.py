@@ -0,0 +1,20 @@
+import uvicorn
+
+from app.core.app import create_app
+from app.core.config import settings
+
+app = create_app()
+
+
+def main() -> None:
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        loop="uvloop",
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Fake OpenAI-style chat model for load tests and benchmarks.
+
+The mock sits inside tight benchmark loops, so its own per-call cost has to
+stay negligible — otherwise load tests profile the mock instead of the system
+under test. Responses and their token counts are paired up once at
+construction, and the completion date string is cached per day.
+"""
+
+import functools
+import random
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+_DEFAULT_RESPONSES = (
+    "This is a fake response from the mock chat model.",
+    "Another canned completion, useful for throughput testing.",
+    "The quick brown fox jumps over the lazy dog.",
+)
+
+#: randrange bound to the instance method once; random.choice pays an extra
+#: bounds conversion per call on top of the module-singleton dispatch.
+_randrange = random.Random().randrange
+
+
+@functools.lru_cache(maxsize=1)
+def _date_for_day(day: int) -> str:
+    """Completion date string, recomputed only when the UTC day changes."""
+    return time.strftime("%Y-%m-%d", time.gmtime(day * 86400))
+
+
+class FakeOpenAIChatModel(BaseChatModel):
+    """Chat model returning canned responses with OpenAI-shaped usage data."""
+
+    model: str = "fake-gpt"
+    responses: tuple[str, ...] = _DEFAULT_RESPONSES
+
+    #: (text, completion_tokens) pairs, paired once at construction so
+    #: _generate never splits a response string on the hot path.
+    _responses_with_tokens: tuple = PrivateAttr()
+
+    def model_post_init(self, __context) -> None:
+        # ~1.2 tokens per word approximates OpenAI tokenization closely
+        # enough for load numbers.
+        self._responses_with_tokens = tuple(
+            (text, int(len(text.split()) * 1.2)) for text in self.responses
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-openai-chat"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text, completion_tokens = self._responses_with_tokens[
+            _randrange(len(self._responses_with_tokens))
+        ]
+        # count(" ") + 1 approximates the word count without materializing
+        # the intermediate list a split() would build.
+        prompt_tokens = sum(m.content.count(" ") + 1 for m in messages)
+        now = time.time()
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=text))],
+            llm_output={
+                "model_name": self.model,
+                "created": int(now),
+                "date": _date_for_day(int(now // 86400)),
+                "token_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
@@ -0,0 +1,124 @@
+"""Standalone fake OpenAI-compatible server for load testing.
+
+Run with ``uvicorn app.mock.fake_llm_server:app`` to give benchmarks an
+upstream that answers like the real thing without network or GPU latency.
+Uses the same pure-ASGI LoggingMiddleware as the main app — no
+BaseHTTPMiddleware task group or Request/Response materialization per call.
+Requires the langchain extra, same as chain_store.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from langchain_core.messages import HumanMessage
+
+from app.core.middleware import LoggingMiddleware
+from app.mock.fake_llm import FakeOpenAIChatModel
+
+#: Constant endpoint payloads, rendered to bytes once at import. Handlers
+#: return them via plain Response, skipping jsonable_encoder and the JSON
+#: render per request entirely.
+_MODELS_BYTES = orjson.dumps(
+    {
+        "object": "list",
+        "data": [
+            {"id": "fake-gpt", "object": "model", "owned_by": "yallmp"},
+            {"id": "fake-gpt-mini", "object": "model", "owned_by": "yallmp"},
+        ],
+    }
+)
+
+_STATUS_BYTES = b'{"status":"ok"}'
+
+_EMBEDDINGS_BYTES = orjson.dumps(
+    {
+        "object": "list",
+        "data": [{"object": "embedding", "index": 0, "embedding": [0.1] * 16}],
+        "model": "fake-embedding",
+    }
+)
+
+_FT_JOBS_BYTES = orjson.dumps({"object": "list", "data": [], "has_more": False})
+_FT_CREATE_BYTES = orjson.dumps(
+    {"object": "fine_tuning.job", "id": "ftjob-fake", "status": "queued"}
+)
+
+_JSON = "application/json"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.llm = FakeOpenAIChatModel()
+    yield
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="fake-llm", lifespan=lifespan, default_response_class=ORJSONResponse
+    )
+    app.add_middleware(LoggingMiddleware)
+
+    # Constant endpoints stay async: a sync def would be dispatched through
+    # anyio's threadpool (a thread hop per call, capped around 40 workers),
+    # which costs more than awaiting a coroutine that just returns bytes.
+    @app.get("/status")
+    async def status():
+        return Response(_STATUS_BYTES, media_type=_JSON)
+
+    @app.get("/v1/models")
+    async def models():
+        return Response(_MODELS_BYTES, media_type=_JSON)
+
+    @app.delete("/v1/models/{model}")
+    async def delete_model(model: str):
+        return Response(
+            orjson.dumps({"id": model, "object": "model", "deleted": True}),
+            media_type=_JSON,
+        )
+
+    @app.post("/v1/embeddings")
+    async def embeddings():
+        return Response(_EMBEDDINGS_BYTES, media_type=_JSON)
+
+    @app.get("/v1/fine_tuning/jobs")
+    async def list_fine_tuning_jobs():
+        return Response(_FT_JOBS_BYTES, media_type=_JSON)
+
+    @app.post("/v1/fine_tuning/jobs")
+    async def create_fine_tuning_job():
+        return Response(_FT_CREATE_BYTES, media_type=_JSON)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        llm: FakeOpenAIChatModel = app.state.llm
+        messages = [
+            HumanMessage(content=m.get("content", ""))
+            for m in body.get("messages", ())
+        ]
+        result = llm._generate(messages)
+        output = result.llm_output
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": output["created"],
+            "model": body.get("model", output["model_name"]),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": result.generations[0].message.content,
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": output["token_usage"],
+        }
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class HealthCheck(BaseModel):
+    status: str
+    components: dict[str, str]
+    version: str
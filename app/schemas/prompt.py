@@ -0,0 +1,14 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ChainType(str, Enum):
+    chain = "chain"
+    prompt = "prompt"
+
+
+class ChainMetadataForTracking(BaseModel):
+    chain_type: ChainType
+    chain_name: str
+    group_id: str = "unknown"
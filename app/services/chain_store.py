@@ -0,0 +1,257 @@
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import orjson
+import structlog
+from langchain.chains import LLMChain
+from langchain.chains.loading import load_chain
+from langchain.llms.loading import load_llm_from_config
+from langchain.prompts import PromptTemplate
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+#: Dedicated RNG for fallback jitter, bound past the module singleton.
+_uniform = random.Random().uniform
+
+
+def safe_parse_gigachat_exception(e: Exception) -> dict:
+    """Extract the structured error payload from a GigaChat client exception.
+
+    The client wraps the upstream JSON error (sometimes double-encoded) in the
+    exception args; fall back to the plain message when it is not JSON. This
+    runs on every caught exception — 429 storms included — so the common case
+    is a single orjson pass over bytes/str with no intermediate decode; only
+    the double-encoded shape pays a second parse.
+    """
+    raw = e.args[1] if len(e.args) > 1 else str(e)
+    try:
+        parsed = orjson.loads(raw)
+        if isinstance(parsed, str):
+            parsed = orjson.loads(parsed)
+        if isinstance(parsed, dict):
+            return parsed
+    except (ValueError, TypeError):
+        pass
+    return {"message": str(e)}
+
+
+@dataclass(frozen=True, slots=True)
+class ChainEntry:
+    """Immutable per-chain record built once at load time.
+
+    Slotted attribute access beats string-keyed dict lookups on the request
+    path, entries can be shared freely because nothing can mutate them, and
+    ``encoded`` carries the listing projection pre-rendered as a JSON
+    ``"name": {...}`` pair so get_chains only joins bytes.
+    """
+
+    path: str
+    description: str
+    category: str
+    model: object
+    metadata: dict
+    input_variables: tuple
+    partial_variables: dict
+    encoded: bytes
+
+
+class StaticChainStore:
+    """Loads chain definitions from disk and executes them on demand."""
+
+    def __init__(self):
+        self.stored_chains: dict[str, ChainEntry] = {}
+        # Compiled chains keyed by name -> (source mtime, chain). load_chain
+        # re-reads and re-parses the JSON and rebuilds the whole langchain
+        # object graph on every call; caching it makes that a first-call-only
+        # cost, with the mtime check picking up edited files.
+        self._compiled: dict[str, tuple[float, object]] = {}
+        self._compile_lock = asyncio.Lock()
+        # Model name -> monotonic deadline until which it is considered dead.
+        # Shared across in-flight requests so one "no such model" failure
+        # spares everyone else the doomed upstream call during the cooldown.
+        self._bad_models: dict[str, float] = {}
+        self._load_chains()
+        # The default llm config is static; parse and build it once here
+        # instead of re-reading the file on every execute_prompt call. A
+        # missing/broken file degrades to the old per-call load.
+        self._default_llm = None
+        try:
+            with open(settings.chain_default_json_file) as f:
+                config = json.loads(os.path.expandvars(f.read()))
+            self._default_llm = load_llm_from_config(config)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(
+                "default llm config unavailable",
+                path=settings.chain_default_json_file,
+                details=str(exc),
+            )
+
+    async def _get_chain(self, chain_name: str):
+        """Return the compiled chain for ``chain_name``, building it once.
+
+        The lock only guards construction, so a cold start with many
+        concurrent requests compiles each chain once instead of N times; the
+        cached fast path stays lock-free.
+        """
+        path = self.stored_chains[chain_name].path
+        mtime = os.stat(path).st_mtime
+        cached = self._compiled.get(chain_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        async with self._compile_lock:
+            cached = self._compiled.get(chain_name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            chain = load_chain(path)
+            self._compiled[chain_name] = (mtime, chain)
+            return chain
+
+    @staticmethod
+    def _parse_chain_file(path: str) -> "tuple[str, dict] | None":
+        """Read and parse one chain file; None when the JSON is invalid."""
+        try:
+            with open(path, "rb") as f:
+                config = orjson.loads(f.read())
+        except ValueError as exc:
+            logger.warning("skipping invalid chain file", path=path, details=str(exc))
+            return None
+        fname = os.path.basename(path)
+        name = config.get("name", fname[: -len(".json")])
+        projection = {
+            "model": config.get("model"),
+            "metadata": config.get("metadata", {}),
+            "input_variables": config.get("input_variables", []),
+            "partial_variables": config.get("partial_variables", {}),
+        }
+        return name, ChainEntry(
+            path=path,
+            description=config.get("description", ""),
+            category=config.get("category", "default"),
+            model=projection["model"],
+            metadata=projection["metadata"],
+            input_variables=tuple(projection["input_variables"]),
+            partial_variables=projection["partial_variables"],
+            encoded=orjson.dumps(name) + b":" + orjson.dumps(projection),
+        )
+
+    def _load_chains(self) -> None:
+        self.stored_chains = {}
+        # Memoized category=None listing; rebuilt lazily after each reload.
+        self._all_chains_cache = None
+        chains_dir = settings.chains_path
+        if not os.path.isdir(chains_dir):
+            logger.warning("chains directory missing", path=chains_dir)
+            return
+        paths = [
+            os.path.join(chains_dir, fname)
+            for fname in os.listdir(chains_dir)
+            if fname.endswith(".json")
+        ]
+        # Each file is an independent open + read, so a thread pool overlaps
+        # the disk I/O; on a cold start with many chains this divides load
+        # time by the pool width instead of paying each read back to back.
+        if paths:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+                for parsed in ex.map(self._parse_chain_file, paths):
+                    if parsed is not None:
+                        self.stored_chains[parsed[0]] = parsed[1]
+        logger.info("chains loaded", count=len(self.stored_chains))
+
+    def get_chains(self, category: str | None = None) -> bytes:
+        """JSON-encoded chain listing assembled from per-entry blobs.
+
+        Each entry's projection was rendered at load time, so a listing is a
+        byte join — no dict traversal or JSON encoding per request.
+        """
+        if category is None and self._all_chains_cache is not None:
+            return self._all_chains_cache
+        result = (
+            b"{"
+            + b",".join(
+                entry.encoded
+                for entry in self.stored_chains.values()
+                if category is None or entry.category == category
+            )
+            + b"}"
+        )
+        if category is None:
+            self._all_chains_cache = result
+        return result
+
+    async def read_config(self, path: str) -> dict:
+        with open(path) as f:
+            raw = f.read()
+        return json.loads(os.path.expandvars(raw))
+
+    async def execute(self, chain_name, inputs, metadata=None, model=None, base_url=None):
+        if chain_name not in self.stored_chains:
+            raise KeyError(f"Unknown chain: {chain_name}")
+        chain = await self._get_chain(chain_name)
+        # The cached chain is shared across requests; shallow-copy it and its
+        # llm before the per-request mutations here and the fallback-model
+        # rewrites in execute_chain.
+        chain = copy.copy(chain)
+        chain.llm = copy.copy(chain.llm)
+        if model:
+            chain.llm.model = model
+        if base_url:
+            chain.llm.base_url = base_url
+        return await self.execute_chain(chain, inputs, metadata=metadata)
+
+    async def execute_prompt(self, template, inputs, metadata=None):
+        if self._default_llm is not None:
+            # model_copy is a cheap shallow copy: execute_chain may rewrite
+            # llm.model on fallback and must not touch the shared instance.
+            llm = self._default_llm.model_copy()
+        else:
+            config = await self.read_config(settings.chain_default_json_file)
+            llm = load_llm_from_config(config)
+        chain = LLMChain(llm=llm, prompt=PromptTemplate.from_template(template))
+        return await self.execute_chain(chain, inputs, metadata=metadata)
+
+    async def execute_chain(self, chain, inputs, metadata=None):
+        fallback_models = settings.chain_fallback_models
+        max_fallbacks = len(fallback_models)
+        cooldown = settings.chain_bad_model_cooldown
+        for attempt in range(max_fallbacks + 1):
+            model = getattr(chain.llm, "model", None)
+            until = self._bad_models.get(model)
+            if until is not None:
+                if time.monotonic() >= until:
+                    # Cooldown over: let this request probe the model again.
+                    self._bad_models.pop(model, None)
+                elif attempt < max_fallbacks:
+                    # Another request already found this model dead; move to
+                    # the next fallback without the doomed upstream call.
+                    chain.llm.model = fallback_models[attempt]
+                    continue
+            try:
+                return await chain.ainvoke(inputs, config={"metadata": metadata or {}})
+            except Exception as e:
+                parsed = safe_parse_gigachat_exception(e)
+                message = str(parsed.get("message", "")).lower()
+                if "no such model" in message and attempt < max_fallbacks:
+                    if model is not None:
+                        self._bad_models[model] = time.monotonic() + cooldown
+                    logger.warning(
+                        "model unavailable, falling back",
+                        model=model,
+                        fallback=fallback_models[attempt],
+                    )
+                    chain.llm.model = fallback_models[attempt]
+                    # Jittered pause so concurrent requests that all just
+                    # failed don't hit the fallback model in lockstep.
+                    await asyncio.sleep(_uniform(0.0, 0.1 * (attempt + 1)))
+                    continue
+                raise
+
+
+chain_store = StaticChainStore()
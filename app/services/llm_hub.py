@@ -0,0 +1,66 @@
+import structlog
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class Provider(BaseModel):
+    """One upstream LLM provider reachable through the proxy."""
+
+    name: str
+    base_url: str
+    prefix: str = ""
+    models: list[str] = []
+    api_key: str | None = None
+
+
+class LlmHub:
+    """Registry of upstream providers and the models they expose.
+
+    Models are advertised with the provider prefix prepended (for example
+    ``openai/gpt-4o``), and incoming requests are routed back to the owning
+    provider by resolving that prefixed name.
+    """
+
+    def __init__(self):
+        self.providers: list[Provider] = []
+        self._alias_map: dict[str, tuple[Provider, str]] = {}
+
+    def load_providers(self) -> None:
+        self.providers = [Provider(**entry) for entry in settings.llm_providers]
+        # Precompute prefixed-alias -> (provider, upstream model) so the hot
+        # resolve path is a single dict lookup; rebuilt on every (re)load.
+        self._alias_map = {
+            f"{provider.prefix}{model}": (provider, model)
+            for provider in self.providers
+            for model in provider.models
+        }
+        logger.info("providers loaded", count=len(self.providers))
+
+    def get_merged_models(self) -> dict:
+        """Merge every provider's model list into one OpenAI-style listing."""
+        data = []
+        for provider in self.providers:
+            for model in provider.models:
+                data.append(
+                    {
+                        "id": f"{provider.prefix}{model}",
+                        "object": "model",
+                        "owned_by": provider.name,
+                    }
+                )
+        return {"object": "list", "data": data}
+
+    def resolve_model(self, model: str) -> tuple[Provider, str] | None:
+        """Map a prefixed model name to ``(provider, upstream_model_name)``."""
+        resolved = self._alias_map.get(model)
+        if resolved is not None:
+            return resolved
+        # Fall back to a prefix scan for models not in the advertised lists
+        # (e.g. a provider serving aliases it does not enumerate).
+        for provider in self.providers:
+            if provider.prefix and model.startswith(provider.prefix):
+                return provider, model[len(provider.prefix):]
+        return None